@@ -10,3 +10,10 @@ from .version import __version__
 from .client import Client
 
 __all__ = ['Client']
+
+try:
+    # the async client is only available if the optional httpx dependency is installed
+    from .async_client import AsyncClient
+    __all__.append('AsyncClient')
+except ImportError:
+    pass
@@ -0,0 +1,554 @@
+"""
+An asyncio client for Notion's API using HTTPX
+
+This module requires the optional httpx dependency (pip install notion-requests[async])
+"""
+
+import asyncio
+
+import httpx
+
+from functools import partial
+from typing import Any, AsyncGenerator, Callable, Iterable
+
+from .client import _ACCEPT_ENCODING, _RateLimiter, _dumps, _json, _set_cursor
+
+try:
+    # h2 is an optional dependency (httpx[http2]) that lets many requests multiplex over one TLS connection
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+class AsyncClient:
+    # the attribute set is small and fixed, so slots save a per instance dict and speed up attribute lookups
+    __slots__ = (
+        '_headers', '_url_prefix', '_client', '_semaphore', '_limiter', '_inflight',
+        'databases', 'pages', 'blocks', 'users', 'search'
+    )
+
+    _BASE_URL = 'https://api.notion.com'
+    _API_VERSION = 'v1'
+    _NOTION_VERSION = '2021-08-16'
+    _MAX_CONNECTIONS = 64
+    _MAX_KEEPALIVE_CONNECTIONS = 32
+    _RATE_LIMIT = 3.0
+    _MAX_RATE_LIMIT_RETRIES = 5
+
+    def __init__(
+        self,
+        auth: str,
+        notion_version: str = _NOTION_VERSION,
+        api_version: str = _API_VERSION,
+        max_concurrency: int = _MAX_CONNECTIONS,
+        rate_limit: float = _RATE_LIMIT
+    ):
+        """
+        Initializes an asyncio Notion client object to make concurrent requests to the Notion API.
+        See https://developers.notion.com/reference/intro for more information
+
+        :param auth: The Notion authorization token
+        :param notion_version: The Notion version
+        :param api_version: The api version
+        :param max_concurrency: The maximum number of requests that can be in flight at once
+        :param rate_limit: The maximum number of requests per second, matching Notion's documented limit of an
+            average of 3 requests per second. Set to None or 0 to disable pacing
+        """
+        self._headers = {
+            'Authorization': f'Bearer {auth}',
+            'Notion-Version': notion_version,
+            'Content-Type': 'application/json',
+            'Accept-Encoding': _ACCEPT_ENCODING
+        }
+        self._url_prefix = f'{self._BASE_URL}/{api_version}'
+
+        limits = httpx.Limits(
+            max_connections=self._MAX_CONNECTIONS,
+            max_keepalive_connections=self._MAX_KEEPALIVE_CONNECTIONS
+        )
+        self._client = httpx.AsyncClient(headers=self._headers, limits=limits, http2=_HTTP2)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiter = _RateLimiter(rate_limit) if rate_limit else None
+
+        # in flight get requests keyed by url and body, so concurrent tasks asking for the same
+        # resource share one wire request instead of each spending a rate limit token
+        self._inflight = {}
+
+        self.databases = AsyncDatabases(self)
+        self.pages = AsyncPages(self)
+        self.blocks = AsyncBlocks(self)
+        self.users = AsyncUsers(self)
+        self.search = AsyncSearch(self)
+
+    async def request(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """
+        Makes a request to the Notion API with the correct Authorization headers and Notion Version
+
+        :param method: GET, POST, PATCH, or DELETE
+        :param endpoint: the path of the endpoint that comes after the base url and version
+        :param kwargs: any other kwargs
+        :return: A httpx response object
+        """
+        return await self._request_url(method, f'{self._url_prefix}/{endpoint}', **kwargs)
+
+    async def _request_url(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Makes a request to an already built url. The endpoints precompute their urls once, so this skips the
+        per call url formatting in request. Identical concurrent get requests are coalesced into a single
+        wire request whose response is shared by every caller
+
+        :param method: GET, POST, PATCH, or DELETE
+        :param url: the full url to request
+        :param kwargs: any other kwargs
+        :return: A httpx response object
+        """
+        # only coalesce when the body is the sole kwarg: kwargs like params, json, or per call
+        # headers change the response without being in the key
+        if method != 'GET' or any(k != 'content' for k in kwargs):
+            return await self._send(method, url, **kwargs)
+
+        # the check and install happen without an await in between, so no lock is needed on the event loop
+        key = (url, kwargs.get('content'))
+        future = self._inflight.get(key)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            r = await self._send(method, url, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            # the owner re-raises below, so mark the exception retrieved in case there are no waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(r)
+            return r
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Paces, sends, and validates a single request on the client
+
+        :param method: GET, POST, PATCH, or DELETE
+        :param url: the full url to request
+        :param kwargs: any other kwargs
+        :return: A httpx response object
+        """
+        async with self._semaphore:
+            # httpx has no built in retry machinery, so honor the Retry-After header on 429 responses here
+            for _ in range(self._MAX_RATE_LIMIT_RETRIES):
+                if self._limiter is not None:
+                    delay = self._limiter.reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                r = await self._client.request(method, url, **kwargs)
+                retry_after = r.headers.get('Retry-After')
+                if r.status_code != 429 or retry_after is None:
+                    break
+
+                await asyncio.sleep(float(retry_after))
+
+        r.raise_for_status()
+
+        return r
+
+    async def close(self):
+        """
+        Closes the underlying client and releases its pooled connections
+        """
+        await self._client.aclose()
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class AsyncEndpoint:
+    __slots__ = (
+        '_client', '_name', '_url_base',
+        '_request_get', '_request_post', '_request_patch', '_request_delete'
+    )
+
+    # overrides the url path for endpoints whose class name does not match it
+    _PATH = None
+
+    def __init__(self, client: AsyncClient):
+        """
+        Initializes a Notion Endpoint object
+
+        :param client: An AsyncClient object
+        """
+        self._client = client
+        self._name = self._PATH or self.__class__.__name__.lower().replace('async', '', 1)
+        # precomputed once so each request is a single string concatenation instead of rebuilding the
+        # prefix from its parts on every call
+        self._url_base = f'{client._url_prefix}/{self._name}'
+        # one bound partial per verb, so each call is a single invocation instead of chasing
+        # self._client._request_url and re-dispatching on the method string every time
+        self._request_get = partial(client._request_url, 'GET')
+        self._request_post = partial(client._request_url, 'POST')
+        self._request_patch = partial(client._request_url, 'PATCH')
+        self._request_delete = partial(client._request_url, 'DELETE')
+
+    def _build_url(self, action: str) -> str:
+        """
+        Builds the full endpoint url by appending action to the precomputed url prefix
+
+        :param action: The part the comes after the name in the endpoint url
+        :return: The full endpoint url
+        """
+        if action is not None:
+            return f'{self._url_base}/{action}'
+
+        return self._url_base
+
+    async def _get(self, action: str = None, **kwargs: Any) -> httpx.Response:
+        """
+        Makes an authenticated get request
+
+        :param action: The part the comes after the name in the endpoint url
+        :param kwargs: Any additional request kwargs
+        :return: A httpx response object
+        """
+        return await self._request_get(self._build_url(action), **kwargs)
+
+    async def _post(self, action: str = None, **kwargs: Any) -> httpx.Response:
+        """
+        Makes an authenticated post request
+
+        :param action: The part the comes after the name in the endpoint url
+        :param kwargs: Any additional request kwargs
+        :return: A httpx response object
+        """
+        return await self._request_post(self._build_url(action), **kwargs)
+
+    async def _patch(self, action: str = None, **kwargs: Any) -> httpx.Response:
+        """
+        Makes an authenticated patch request
+
+        :param action: The part the comes after the name in the endpoint url
+        :param kwargs: Any additional request kwargs
+        :return: A httpx response object
+        """
+        return await self._request_patch(self._build_url(action), **kwargs)
+
+    async def _delete(self, action: str = None, **kwargs: Any) -> httpx.Response:
+        """
+        Makes an authenticated delete request
+
+        :param action: The part the comes after the name in the endpoint url
+        :param kwargs: Any additional request kwargs
+        :return: A httpx response object
+        """
+        return await self._request_delete(self._build_url(action), **kwargs)
+
+    async def _paginate(
+        self,
+        method: str,
+        action: str,
+        payload: dict,
+        prefetch: bool = False,
+        decoder: Callable = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Requests every page of a paginated endpoint. The payload is encoded once and the next cursor is
+        spliced into the encoded body for each following page
+
+        :param method: GET, POST, or PATCH
+        :param action: The part the comes after the name in the endpoint url
+        :param payload: json payload
+        :param prefetch: requests the next page in the background while the caller consumes the current one,
+            overlapping the caller's work with the next round trip
+        :param decoder: decodes each raw page body into a models.QueryResponse struct instead of a dict
+        :return: An async generator object with each item being the output of a single api request
+        """
+        url = self._build_url(action)
+        r = await self._client._request_url(method, url, content=_dumps(payload))
+        data = decoder(r.content) if decoder is not None else _json(r)
+
+        template = None
+        body = None
+        task = None
+        try:
+            while True:
+                if decoder is not None:
+                    has_more, cursor = data.has_more, data.next_cursor
+                else:
+                    has_more, cursor = data['has_more'], data.get('next_cursor')
+
+                if has_more:
+                    if template is None:
+                        payload.pop('start_cursor', None)
+                        template = _dumps(payload)
+
+                    body = _set_cursor(template, cursor)
+                    if prefetch:
+                        task = asyncio.ensure_future(self._client._request_url(method, url, content=body))
+
+                yield data
+                if not has_more:
+                    break
+
+                if task is None:
+                    r = await self._client._request_url(method, url, content=body)
+                else:
+                    r = await task
+                    task = None
+
+                data = decoder(r.content) if decoder is not None else _json(r)
+        finally:
+            # cancel the speculative request if the caller stops iterating early
+            if task is not None:
+                task.cancel()
+
+    async def _retrieve_many(self, ids: Iterable[str]) -> list:
+        """
+        Retrieves many objects concurrently so their round trips overlap instead of being paid one at a time.
+        The client's semaphore caps how many are in flight at once
+
+        :param ids: The object ids to retrieve
+        :return: a list of the json outputs of each retrieve api request, in the same order as ids
+        """
+        return await asyncio.gather(*(self.retrieve(object_id) for object_id in ids))
+
+
+class AsyncDatabases(AsyncEndpoint):
+    __slots__ = ()
+
+    def query(self, database_id: str, prefetch: bool = False, struct: bool = False, **payload: Any):
+        """
+        Queries a database with filters and sorts
+
+        :param database_id: The database id
+        :param prefetch: requests the next page in the background while the current page is being consumed
+        :param struct: decodes each page into a models.QueryResponse struct instead of a dict, which is faster
+            and lighter for large pages. Requires the optional msgspec dependency
+        :param payload: json payload
+        :return: an async generator object with each item being the output of a single query api request
+        """
+        decoder = None
+        if struct:
+            from .models import decode_query_response
+            decoder = decode_query_response
+
+        return self._paginate('POST', f'{database_id}/query', payload, prefetch=prefetch, decoder=decoder)
+
+    async def create(self, **payload: Any):
+        """
+        Creates a database
+
+        :param payload: json payload
+        :return: the json output of the create api request
+        """
+        r = await self._post(content=_dumps(payload))
+        return _json(r)
+
+    async def update(self, database_id: str, **payload: Any):
+        """
+        Updates a database with new/existing properties
+
+        :param database_id: The database id
+        :param payload: json payload
+        :return: the json output of the update api request
+        """
+        r = await self._patch(database_id, content=_dumps(payload))
+        return _json(r)
+
+    async def retrieve(self, database_id: str, **payload: Any):
+        """
+        Retrieves a database info
+
+        :param database_id: The database id
+        :param payload: json payload
+        :return: the json output of the retrieve api request
+        """
+        r = await self._get(database_id, content=_dumps(payload))
+        return _json(r)
+
+    def list(self, prefetch: bool = False, **payload: Any):
+        """
+        Lists all the databases shared with the authenticated integration
+
+        :param prefetch: requests the next page in the background while the current page is being consumed
+        :param payload: json payload
+        :return: an async generator object with each item being the json output of a single list api request
+        """
+        return self._paginate('GET', None, payload, prefetch=prefetch)
+
+
+class AsyncPages(AsyncEndpoint):
+    __slots__ = ()
+
+    async def retrieve(self, page_id: str, **payload: Any):
+        """
+        Retrieves a page info
+
+        :param page_id: The page id
+        :param payload: json payload
+        :return: the json output of the retrieve api request
+        """
+        r = await self._get(page_id, content=_dumps(payload))
+        return _json(r)
+
+    async def create(self, **payload: Any):
+        """
+        Creates a page
+
+        :param payload: json payload
+        :return: the json output of the create api request
+        """
+        r = await self._post(content=_dumps(payload))
+        return _json(r)
+
+    async def update(self, page_id: str, **payload: Any):
+        """
+        Updates a page
+
+        :param page_id: The page id
+        :param payload: json payload
+        :return: the json output of the update api request
+        """
+        r = await self._patch(page_id, content=_dumps(payload))
+        return _json(r)
+
+    async def retrieve_many(self, page_ids: Iterable[str]):
+        """
+        Retrieves many pages concurrently
+
+        :param page_ids: The page ids
+        :return: a list of the json outputs of each retrieve api request, in the same order as page_ids
+        """
+        return await self._retrieve_many(page_ids)
+
+
+class AsyncBlocks(AsyncEndpoint):
+    __slots__ = ('children',)
+
+    def __init__(self, client: AsyncClient):
+        super().__init__(client)
+
+        self.children = AsyncBlocksChildren(client)
+
+    async def retrieve(self, block_id: str, **payload: Any):
+        """
+        Retrieves a block info
+
+        :param block_id: The block id
+        :param payload: json payload
+        :return: the json output of the retrieve api request
+        """
+        r = await self._get(block_id, content=_dumps(payload))
+        return _json(r)
+
+    async def update(self, block_id: str, **payload: Any):
+        """
+        Updates a block
+
+        :param block_id: The block id
+        :param payload: json payload
+        :return: the json output of the update api request
+        """
+        r = await self._patch(block_id, content=_dumps(payload))
+        return _json(r)
+
+    async def delete(self, block_id: str, **payload: Any):
+        """
+        Deletes a block
+
+        :param block_id: The block id
+        :param payload: json payload
+        :return: the json output of the delete api request
+        """
+        r = await self._delete(block_id, content=_dumps(payload))
+        return _json(r)
+
+    async def retrieve_many(self, block_ids: Iterable[str]):
+        """
+        Retrieves many blocks concurrently
+
+        :param block_ids: The block ids
+        :return: a list of the json outputs of each retrieve api request, in the same order as block_ids
+        """
+        return await self._retrieve_many(block_ids)
+
+
+class AsyncBlocksChildren(AsyncEndpoint):
+    __slots__ = ()
+
+    _PATH = 'blocks'
+
+    def list(self, block_id: str, prefetch: bool = False, **payload: Any):
+        """
+        Lists a block's children
+
+        :param block_id: The block id
+        :param prefetch: requests the next page in the background while the current page is being consumed
+        :param payload: json payload
+        :return: an async generator object with each item being the json output of a single list api request
+        """
+        return self._paginate('GET', f'{block_id}/children', payload, prefetch=prefetch)
+
+    def append(self, block_id: str, **payload: Any):
+        """
+        Appends content to a container block
+
+        :param block_id: The block id
+        :param payload: json payload
+        :return: an async generator object with each item being the json output of a single append api request
+        """
+        return self._paginate('PATCH', f'{block_id}/children', payload)
+
+
+class AsyncUsers(AsyncEndpoint):
+    __slots__ = ()
+
+    async def retrieve(self, user_id: str, **payload: Any):
+        """
+        Retrieves a user info
+
+        :param user_id: The user id
+        :param payload: json payload
+        :return: the json output of the retrieve api request
+        """
+        r = await self._get(user_id, content=_dumps(payload))
+        return _json(r)
+
+    def list(self, prefetch: bool = False, **payload: Any):
+        """
+        Lists all users
+
+        :param prefetch: requests the next page in the background while the current page is being consumed
+        :param payload: json payload
+        :return: an async generator object with each item being the json output of a single list api request
+        """
+        return self._paginate('GET', None, payload, prefetch=prefetch)
+
+    async def me(self):
+        """
+        Retrieves your token's bot user
+
+        :return: the json output of the me api request
+        """
+        r = await self._get('me')
+        return _json(r)
+
+
+class AsyncSearch(AsyncEndpoint):
+    __slots__ = ()
+
+    def __call__(self, prefetch: bool = False, **payload: Any):
+        """
+        Searches all pages and child pages that are shared with the integration. The results may include databases.
+
+        :param prefetch: requests the next page in the background while the current page is being consumed
+        :param payload: json payload
+        :return: an async generator object with each item being the json output of a single search api request
+        """
+        return self._paginate('POST', None, payload, prefetch=prefetch)
@@ -2,21 +2,159 @@
 A client for Notion's API using Requests
 """
 
+import threading
+import time
+
 import requests
+import urllib3
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Generator, Iterable
+from urllib3.util.retry import Retry
+
+try:
+    # orjson is an optional dependency with a much faster C json encoder and decoder
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+
+try:
+    # brotli compresses the large paginated responses noticeably better than gzip, but it can only be
+    # advertised when a decoder is installed (either the brotli or brotlicffi package)
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = 'gzip, br'
+    except ImportError:
+        _ACCEPT_ENCODING = 'gzip'
+
+
+def _json(response) -> Any:
+    """
+    Decodes a response body with the fastest available json decoder
+
+    :param response: A response object with a content attribute
+    :return: the decoded json data
+    """
+    return _loads(response.content)
+
+
+def _set_cursor(body: bytes, cursor: str) -> bytes:
+    """
+    Splices a start_cursor key into an already encoded json body, so large filter and sort payloads do not
+    have to be re-serialized for every page
+
+    :param body: The encoded json payload without a start_cursor key
+    :param cursor: The next page's cursor
+    :return: The encoded json payload with the start_cursor set
+    """
+    encoded = b'"start_cursor":' + _dumps(cursor)
+    if body == b'{}':
+        return b'{' + encoded + b'}'
+
+    return body[:-1] + b',' + encoded + b'}'
+
+
+def _stream_results(response: requests.Response, state: dict) -> Generator[dict, None, None]:
+    """
+    Incrementally parses the results array of a streamed response, yielding one result at a time so the full
+    response body never has to be buffered. The top level has_more and next_cursor fields are recorded in state
+    as they are parsed so the caller can continue paginating.
+
+    :param response: A requests response object opened with stream=True
+    :param state: A dict that has_more and next_cursor are written into
+    :return: A generator object with each item being a single result dict
+    """
+    # ijson is an optional dependency that is only needed for the streaming endpoint variants
+    import ijson
+
+    response.raw.decode_content = True
+    builder = None
+    for prefix, event, value in ijson.parse(response.raw):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'results.item' and event == 'end_map':
+                yield builder.value
+                builder = None
+        elif prefix == 'results.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix in ('has_more', 'next_cursor'):
+            state[prefix] = value
+
 
-from typing import Any, Callable, Generator
+class _RateLimiter:
+    """
+    A minimal thread safe token bucket that paces requests to at most rate requests per second. Waiting for a token
+    up front is much cheaper than burning a full round trip on a 429 response and retrying it.
+    """
+    __slots__ = ('_interval', '_lock', '_next_time')
+
+    def __init__(self, rate: float):
+        """
+        :param rate: The maximum number of requests per second
+        """
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserves the next available send slot
+
+        :return: The number of seconds to wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            ready = max(self._next_time, now)
+            self._next_time = ready + self._interval
+            return ready - now
+
+    def acquire(self):
+        """
+        Blocks until a send slot is available
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
 
 
 class Client:
+    # the attribute set is small and fixed, so slots save a per instance dict and speed up attribute lookups
+    __slots__ = (
+        '_headers', '_url_prefix', '_session', '_pool', '_limiter', '_inflight', '_inflight_lock',
+        'databases', 'pages', 'blocks', 'users', 'search'
+    )
+
     _BASE_URL = 'https://api.notion.com'
     _API_VERSION = 'v1'
     _NOTION_VERSION = '2021-08-16'
+    _POOL_MAXSIZE = 32
+    _RETRY_TOTAL = 5
+    _RETRY_BACKOFF_FACTOR = 0.25
+    _RETRY_STATUSES = (429, 502, 503, 504)
+    _RATE_LIMIT = 3.0
+    _CACHE_EXPIRE_AFTER = 300
 
     def __init__(
         self,
         auth: str,
         notion_version: str = _NOTION_VERSION,
-        api_version: str = _API_VERSION
+        api_version: str = _API_VERSION,
+        rate_limit: float = _RATE_LIMIT,
+        cache: Any = False
     ):
         """
         Initializes a Notion client object to make requests to the Notion API.
@@ -25,14 +163,56 @@ class Client:
         :param auth: The Notion authorization token
         :param notion_version: The Notion version
         :param api_version: The api version
+        :param rate_limit: The maximum number of requests per second, matching Notion's documented limit of an
+            average of 3 requests per second. Set to None or 0 to disable pacing
+        :param cache: Caches get requests when set. Pass True for an in memory cache, or any requests-cache
+            backend name or instance. Requires the optional requests-cache dependency
         """
         self._headers = {
             'Authorization': f'Bearer {auth}',
             'Notion-Version': notion_version,
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept-Encoding': _ACCEPT_ENCODING
         }
         self._url_prefix = f'{self._BASE_URL}/{api_version}'
 
+        if cache:
+            # requests-cache is an optional dependency that stores get responses and revalidates them with
+            # conditional requests, so unchanged resources come back as a bodiless 304 instead of a full transfer
+            import requests_cache
+            self._session = requests_cache.CachedSession(
+                backend='memory' if cache is True else cache,
+                cache_control=True,
+                expire_after=self._CACHE_EXPIRE_AFTER,
+                allowable_methods=('GET',)
+            )
+        else:
+            self._session = requests.Session()
+        self._session.headers.update(self._headers)
+
+        # every request goes to the same host, so keep a hot pool of connections to it and let
+        # urllib3 retry transient rate limit and server errors with a backoff instead of raising
+        retry = Retry(
+            total=self._RETRY_TOTAL,
+            backoff_factor=self._RETRY_BACKOFF_FACTOR,
+            status_forcelist=self._RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST', 'PATCH', 'DELETE']),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._POOL_MAXSIZE, max_retries=retry)
+        self._session.mount(f'{self._BASE_URL}/', adapter)
+
+        # a plain urllib3 pool for the raw retrieve fast path. It skips the PreparedRequest, cookie,
+        # redirect, and Response construction work that Session.request does on every call
+        self._pool = urllib3.PoolManager(num_pools=1, maxsize=self._POOL_MAXSIZE, headers=self._headers)
+
+        self._limiter = _RateLimiter(rate_limit) if rate_limit else None
+
+        # in flight get requests keyed by url and body, so concurrent callers asking for the same
+        # resource share one wire request instead of each spending a rate limit token
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
         self.databases = Databases(self)
         self.pages = Pages(self)
         self.blocks = Blocks(self)
@@ -48,34 +228,110 @@ class Client:
         :param kwargs: any other kwargs
         :return: A requests response object
         """
-        url = f'{self._url_prefix}/{endpoint}'
-        r = requests.request(method, url, headers=self._headers, **kwargs)
+        return self._request_url(method, f'{self._url_prefix}/{endpoint}', **kwargs)
+
+    def _request_url(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Makes a request to an already built url. The endpoints precompute their urls once, so this skips the
+        per call url formatting in request. Identical concurrent get requests are coalesced into a single
+        wire request whose response is shared by every caller
+
+        :param method: GET, POST, PATCH, or DELETE
+        :param url: the full url to request
+        :param kwargs: any other kwargs
+        :return: A requests response object
+        """
+        # only coalesce when the body is the sole kwarg: streamed bodies can only be read once, and
+        # kwargs like params, json, or per call headers change the response without being in the key
+        if method != 'GET' or any(k != 'data' for k in kwargs):
+            return self._send(method, url, **kwargs)
+
+        key = (url, kwargs.get('data'))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            r = self._send(method, url, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(r)
+            return r
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Paces, sends, and validates a single request on the session
+
+        :param method: GET, POST, PATCH, or DELETE
+        :param url: the full url to request
+        :param kwargs: any other kwargs
+        :return: A requests response object
+        """
+        if self._limiter is not None:
+            self._limiter.acquire()
+
+        r = self._session.request(method, url, **kwargs)
 
         r.raise_for_status()
 
         return r
 
-    @staticmethod
-    def paginate(fn: Callable, data: dict, *args: Any, **kwargs: Any) -> Generator[dict, None, None]:
+    def _fast_get(self, url: str) -> urllib3.response.HTTPResponse:
         """
-        Automatically paginates the output
+        Makes a get request directly on the urllib3 pool, bypassing the requests layer entirely. The body
+        is left unread, so the caller can decode it in one shot or stream it into an incremental parser
 
-        :param fn: the function to call
-        :param data: the requests json data
-        :param args: any of the function's arguments
-        :param kwargs: any of the function's kwargs
-        :return: A generator object which each item as the request's json data
+        :param url: the full url to request
+        :return: A urllib3 response object with the body left unread
         """
-        yield data
-        if data['has_more']:
-            if kwargs is not None:
-                kwargs['start_cursor'] = data['next_cursor']
-            else:
-                kwargs = {'start_cursor': data['next_cursor']}
-            yield from fn(*args, **kwargs)
+        if self._limiter is not None:
+            self._limiter.acquire()
+
+        r = self._pool.request('GET', url, preload_content=False)
+
+        if r.status >= 400:
+            body = r.read()
+            r.release_conn()
+            raise requests.exceptions.HTTPError(f'{r.status} Error for url: {url}: {body.decode()}')
+
+        return r
+
+    def close(self):
+        """
+        Closes the underlying session and releases its pooled connections
+        """
+        self._session.close()
+        self._pool.clear()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 class Endpoint:
+    __slots__ = (
+        '_client', '_name', '_url_base',
+        '_request_get', '_request_post', '_request_patch', '_request_delete'
+    )
+
+    # overrides the url path for endpoints whose class name does not match it
+    _PATH = None
+
     def __init__(self, client: Client):
         """
         Initializes a Notion Endpoint object
@@ -83,21 +339,28 @@ class Endpoint:
         :param client: A Notion object
         """
         self._client = client
-        self._name = self.__class__.__name__.lower()
+        self._name = self._PATH or self.__class__.__name__.lower()
+        # precomputed once so each request is a single string concatenation instead of rebuilding the
+        # prefix from its parts on every call
+        self._url_base = f'{client._url_prefix}/{self._name}'
+        # one bound partial per verb, so each call is a single invocation instead of chasing
+        # self._client._request_url and re-dispatching on the method string every time
+        self._request_get = partial(client._request_url, 'GET')
+        self._request_post = partial(client._request_url, 'POST')
+        self._request_patch = partial(client._request_url, 'PATCH')
+        self._request_delete = partial(client._request_url, 'DELETE')
 
-    def _build_endpoint(self, action: str) -> str:
+    def _build_url(self, action: str) -> str:
         """
-        Builds the endpoint by prepending the class name to action
+        Builds the full endpoint url by appending action to the precomputed url prefix
 
         :param action: The part the comes after the name in the endpoint url
-        :return: The endpoint path
+        :return: The full endpoint url
         """
         if action is not None:
-            endpoint = f'{self._name}/{action}'
-        else:
-            endpoint = self._name
+            return f'{self._url_base}/{action}'
 
-        return endpoint
+        return self._url_base
 
     def _get(self, action: str = None, **kwargs: Any) -> requests.Response:
         """
@@ -107,7 +370,7 @@ class Endpoint:
         :param kwargs: Any additional request kwargs
         :return: A request response object
         """
-        return self._client.request('GET', self._build_endpoint(action), **kwargs)
+        return self._request_get(self._build_url(action), **kwargs)
 
     def _post(self, action: str = None, **kwargs: Any) -> requests.Response:
         """
@@ -117,7 +380,7 @@ class Endpoint:
         :param kwargs: Any additional request kwargs
         :return: A request response object
         """
-        return self._client.request('POST', self._build_endpoint(action), **kwargs)
+        return self._request_post(self._build_url(action), **kwargs)
 
     def _patch(self, action: str = None, **kwargs: Any) -> requests.Response:
         """
@@ -127,7 +390,7 @@ class Endpoint:
         :param kwargs: Any additional request kwargs
         :return: A request response object
         """
-        return self._client.request('PATCH', self._build_endpoint(action), **kwargs)
+        return self._request_patch(self._build_url(action), **kwargs)
 
     def _delete(self, action: str = None, **kwargs: Any) -> requests.Response:
         """
@@ -137,22 +400,119 @@ class Endpoint:
         :param kwargs: Any additional request kwargs
         :return: A request response object
         """
-        return self._client.request('DELETE', self._build_endpoint(action), **kwargs)
+        return self._request_delete(self._build_url(action), **kwargs)
+
+    def _paginate(
+        self,
+        method: str,
+        action: str,
+        payload: dict,
+        decoder: Callable = None,
+        prefetch: bool = False
+    ) -> Generator[Any, None, None]:
+        """
+        Requests every page of a paginated endpoint. The payload is encoded once and the next cursor is
+        spliced into the encoded body for each following page
+
+        :param method: GET, POST, or PATCH
+        :param action: The part the comes after the name in the endpoint url
+        :param payload: json payload
+        :param decoder: decodes each raw page body into a models.QueryResponse struct instead of a dict
+        :param prefetch: requests the next page on a background thread while the caller consumes the current
+            one, overlapping the caller's work with the next round trip
+        :return: A generator object with each item being the output of a single api request
+        """
+        url = self._build_url(action)
+        r = self._client._request_url(method, url, data=_dumps(payload))
+        data = decoder(r.content) if decoder is not None else _json(r)
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        future = None
+        try:
+            template = None
+            while True:
+                if decoder is not None:
+                    has_more, cursor = data.has_more, data.next_cursor
+                else:
+                    has_more, cursor = data['has_more'], data.get('next_cursor')
+
+                if has_more:
+                    if template is None:
+                        payload.pop('start_cursor', None)
+                        template = _dumps(payload)
+
+                    body = _set_cursor(template, cursor)
+                    if prefetch:
+                        future = executor.submit(self._client._request_url, method, url, data=body)
+
+                yield data
+                if not has_more:
+                    break
+
+                if future is None:
+                    r = self._client._request_url(method, url, data=body)
+                else:
+                    r = future.result()
+                    future = None
+
+                data = decoder(r.content) if decoder is not None else _json(r)
+        finally:
+            if executor is not None:
+                # drop the speculative request if the caller stops iterating early
+                if future is not None:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+    def _retrieve_many(self, ids: Iterable[str], concurrency: int) -> list:
+        """
+        Retrieves many objects concurrently with a thread pool so their round trips overlap instead of being
+        paid one at a time
+
+        :param ids: The object ids to retrieve
+        :param concurrency: The maximum number of requests in flight at once
+        :return: a list of the json outputs of each retrieve api request, in the same order as ids
+        """
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(self.retrieve, ids))
 
 
 class Databases(Endpoint):
-    def query(self, database_id: str, **payload: Any):
+    __slots__ = ()
+
+    def query(self, database_id: str, struct: bool = False, prefetch: bool = False, **payload: Any):
         """
         Queries a database with filters and sorts
 
         :param database_id: The database id
+        :param struct: decodes each page into a models.QueryResponse struct instead of a dict, which is faster
+            and lighter for large pages. Requires the optional msgspec dependency
+        :param prefetch: requests the next page in the background while the current page is being consumed
         :param payload: json payload
-        :return: a generator object with each item being the json output of a single query api request
+        :return: a generator object with each item being the output of a single query api request
+        """
+        decoder = None
+        if struct:
+            from .models import decode_query_response
+            decoder = decode_query_response
+
+        yield from self._paginate('POST', f'{database_id}/query', payload, decoder=decoder, prefetch=prefetch)
+
+    def query_stream(self, database_id: str, **payload: Any):
         """
-        r = self._post(f'{database_id}/query', json=payload)
+        Queries a database with filters and sorts, yielding one result at a time instead of buffering whole
+        pages. Requires the optional ijson dependency
 
-        data = r.json()
-        yield from self._client.paginate(self.query, data, database_id, **payload)
+        :param database_id: The database id
+        :param payload: json payload
+        :return: a generator object with each item being a single result dict
+        """
+        while True:
+            r = self._post(f'{database_id}/query', data=_dumps(payload), stream=True)
+            state = {}
+            yield from _stream_results(r, state)
+            if not state.get('has_more'):
+                break
+            payload['start_cursor'] = state['next_cursor']
 
     def create(self, **payload: Any):
         """
@@ -161,8 +521,8 @@ class Databases(Endpoint):
         :param payload: json payload
         :return: the json output of the create api request
         """
-        r = self._post(json=payload)
-        return r.json()
+        r = self._post(data=_dumps(payload))
+        return _json(r)
 
     def update(self, database_id: str, **payload: Any):
         """
@@ -172,43 +532,54 @@ class Databases(Endpoint):
         :param payload: json payload
         :return: the json output of the update api request
         """
-        r = self._patch(database_id, json=payload)
-        return r.json()
+        r = self._patch(database_id, data=_dumps(payload))
+        return _json(r)
 
-    def retrieve(self, database_id: str, **payload: Any):
+    def retrieve(self, database_id: str, raw: bool = False, **payload: Any):
         """
         Retrieves a database info
 
         :param database_id: The database id
+        :param raw: skips the requests layer and returns the raw urllib3 response with the body left
+            unread, so it can be decoded in one shot or streamed into an incremental parser
         :param payload: json payload
-        :return: the json output of the retrieve api request
+        :return: the json output of the retrieve api request, or the raw urllib3 response when raw is set
         """
-        r = self._get(database_id, json=payload)
-        return r.json()
+        if raw:
+            return self._client._fast_get(self._build_url(database_id))
+
+        r = self._get(database_id, data=_dumps(payload))
+        return _json(r)
 
-    def list(self, **payload: Any):
+    def list(self, prefetch: bool = False, **payload: Any):
         """
         Lists all the databases shared with the authenticated integration
 
+        :param prefetch: requests the next page in the background while the current page is being consumed
         :param payload: json payload
         :return: a generator object with each item being the json output of a single list api request
         """
-        r = self._get(json=payload)
-        data = r.json()
-        yield from self._client.paginate(self.list, data, **payload)
+        yield from self._paginate('GET', None, payload, prefetch=prefetch)
 
 
 class Pages(Endpoint):
-    def retrieve(self, page_id: str, **payload: Any):
+    __slots__ = ()
+
+    def retrieve(self, page_id: str, raw: bool = False, **payload: Any):
         """
         Retrieves a page info
 
         :param page_id: The page id
+        :param raw: skips the requests layer and returns the raw urllib3 response with the body left
+            unread, so it can be decoded in one shot or streamed into an incremental parser
         :param payload: json payload
-        :return: the json output of the retrieve api request
+        :return: the json output of the retrieve api request, or the raw urllib3 response when raw is set
         """
-        r = self._get(page_id, json=payload)
-        return r.json()
+        if raw:
+            return self._client._fast_get(self._build_url(page_id))
+
+        r = self._get(page_id, data=_dumps(payload))
+        return _json(r)
 
     def create(self, **payload: Any):
         """
@@ -217,8 +588,8 @@ class Pages(Endpoint):
         :param payload: json payload
         :return: the json output of the create api request
         """
-        r = self._post(json=payload)
-        return r.json()
+        r = self._post(data=_dumps(payload))
+        return _json(r)
 
     def update(self, page_id: str, **payload: Any):
         """
@@ -228,26 +599,43 @@ class Pages(Endpoint):
         :param payload: json payload
         :return: the json output of the update api request
         """
-        r = self._patch(page_id, json=payload)
-        return r.json()
+        r = self._patch(page_id, data=_dumps(payload))
+        return _json(r)
+
+    def retrieve_many(self, page_ids: Iterable[str], concurrency: int = 16):
+        """
+        Retrieves many pages concurrently
+
+        :param page_ids: The page ids
+        :param concurrency: The maximum number of requests in flight at once
+        :return: a list of the json outputs of each retrieve api request, in the same order as page_ids
+        """
+        return self._retrieve_many(page_ids, concurrency)
 
 
 class Blocks(Endpoint):
+    __slots__ = ('children',)
+
     def __init__(self, client: Client):
         super().__init__(client)
 
         self.children = BlocksChildren(client)
 
-    def retrieve(self, block_id: str, **payload: Any):
+    def retrieve(self, block_id: str, raw: bool = False, **payload: Any):
         """
         Retrieves a block info
 
         :param block_id: The block id
+        :param raw: skips the requests layer and returns the raw urllib3 response with the body left
+            unread, so it can be decoded in one shot or streamed into an incremental parser
         :param payload: json payload
-        :return: the json output of the retrieve api request
+        :return: the json output of the retrieve api request, or the raw urllib3 response when raw is set
         """
-        r = self._get(block_id, json=payload)
-        return r.json()
+        if raw:
+            return self._client._fast_get(self._build_url(block_id))
+
+        r = self._get(block_id, data=_dumps(payload))
+        return _json(r)
 
     def update(self, block_id: str, **payload: Any):
         """
@@ -257,8 +645,8 @@ class Blocks(Endpoint):
         :param payload: json payload
         :return: the json output of the update api request
         """
-        r = self._patch(block_id, json=payload)
-        return r.json()
+        r = self._patch(block_id, data=_dumps(payload))
+        return _json(r)
 
     def delete(self, block_id: str, **payload: Any):
         """
@@ -268,22 +656,52 @@ class Blocks(Endpoint):
         :param payload: json payload
         :return: the json output of the delete api request
         """
-        r = self._delete(block_id, json=payload)
-        return r.json()
+        r = self._delete(block_id, data=_dumps(payload))
+        return _json(r)
+
+    def retrieve_many(self, block_ids: Iterable[str], concurrency: int = 16):
+        """
+        Retrieves many blocks concurrently
+
+        :param block_ids: The block ids
+        :param concurrency: The maximum number of requests in flight at once
+        :return: a list of the json outputs of each retrieve api request, in the same order as block_ids
+        """
+        return self._retrieve_many(block_ids, concurrency)
 
 
 class BlocksChildren(Endpoint):
-    def list(self, block_id: str, **payload: Any):
+    __slots__ = ()
+
+    _PATH = 'blocks'
+
+    def list(self, block_id: str, prefetch: bool = False, **payload: Any):
         """
         Lists a block's children
 
         :param block_id: The block id
+        :param prefetch: requests the next page in the background while the current page is being consumed
         :param payload: json payload
         :return: a generator object with each item being the json output of a single list api request
         """
-        r = self._client.request('GET', f'blocks/{block_id}/children', json=payload)
-        data = r.json()
-        yield from self._client.paginate(self.list, data, block_id, **payload)
+        yield from self._paginate('GET', f'{block_id}/children', payload, prefetch=prefetch)
+
+    def list_stream(self, block_id: str, **payload: Any):
+        """
+        Lists a block's children, yielding one child block at a time instead of buffering whole pages.
+        Requires the optional ijson dependency
+
+        :param block_id: The block id
+        :param payload: json payload
+        :return: a generator object with each item being a single child block dict
+        """
+        while True:
+            r = self._get(f'{block_id}/children', data=_dumps(payload), stream=True)
+            state = {}
+            yield from _stream_results(r, state)
+            if not state.get('has_more'):
+                break
+            payload['start_cursor'] = state['next_cursor']
 
     def append(self, block_id: str, **payload: Any):
         """
@@ -293,33 +711,53 @@ class BlocksChildren(Endpoint):
         :param payload: json payload
         :return: a generator object with each item being the json output of a single append api request
         """
-        r = self._client.request('PATCH', f'blocks/{block_id}/children', json=payload)
-        data = r.json()
-        yield from self._client.paginate(self.append, data, block_id, **payload)
+        yield from self._paginate('PATCH', f'{block_id}/children', payload)
 
 
 class Users(Endpoint):
-    def retrieve(self, user_id: str, **payload: Any):
+    __slots__ = ()
+
+    def retrieve(self, user_id: str, raw: bool = False, **payload: Any):
         """
         Retrieves a user info
 
         :param user_id: The user id
+        :param raw: skips the requests layer and returns the raw urllib3 response with the body left
+            unread, so it can be decoded in one shot or streamed into an incremental parser
         :param payload: json payload
-        :return: the json output of the retrieve api request
+        :return: the json output of the retrieve api request, or the raw urllib3 response when raw is set
         """
-        r = self._get(user_id, json=payload)
-        return r.json()
+        if raw:
+            return self._client._fast_get(self._build_url(user_id))
+
+        r = self._get(user_id, data=_dumps(payload))
+        return _json(r)
 
-    def list(self, **payload: Any):
+    def list(self, prefetch: bool = False, **payload: Any):
         """
         Lists all users
 
+        :param prefetch: requests the next page in the background while the current page is being consumed
         :param payload: json payload
         :return: the json output of the list api request
         """
-        r = self._get(json=payload)
-        data = r.json()
-        yield from self._client.paginate(self.list, data, **payload)
+        yield from self._paginate('GET', None, payload, prefetch=prefetch)
+
+    def list_stream(self, **payload: Any):
+        """
+        Lists all users, yielding one user at a time instead of buffering whole pages. Requires the optional
+        ijson dependency
+
+        :param payload: json payload
+        :return: a generator object with each item being a single user dict
+        """
+        while True:
+            r = self._get(data=_dumps(payload), stream=True)
+            state = {}
+            yield from _stream_results(r, state)
+            if not state.get('has_more'):
+                break
+            payload['start_cursor'] = state['next_cursor']
 
     def me(self):
         """
@@ -328,17 +766,34 @@ class Users(Endpoint):
         :return: the json output of the me api request
         """
         r = self._get('me')
-        return r.json()
+        return _json(r)
 
 
 class Search(Endpoint):
-    def __call__(self, **payload: Any):
+    __slots__ = ()
+
+    def __call__(self, prefetch: bool = False, **payload: Any):
         """
         Searches all pages and child pages that are shared with the integration. The results may include databases.
 
+        :param prefetch: requests the next page in the background while the current page is being consumed
         :param payload: json payload
         :return: the json output of the search api request
         """
-        r = self._post(json=payload)
-        data = r.json()
-        yield from self._client.paginate(self.__call__, data, **payload)
+        yield from self._paginate('POST', None, payload, prefetch=prefetch)
+
+    def stream(self, **payload: Any):
+        """
+        Searches all pages and child pages that are shared with the integration, yielding one result at a time
+        instead of buffering whole pages. Requires the optional ijson dependency
+
+        :param payload: json payload
+        :return: a generator object with each item being a single result dict
+        """
+        while True:
+            r = self._post(data=_dumps(payload), stream=True)
+            state = {}
+            yield from _stream_results(r, state)
+            if not state.get('has_more'):
+                break
+            payload['start_cursor'] = state['next_cursor']
@@ -0,0 +1,35 @@
+"""
+msgspec models for hot response shapes
+
+This module requires the optional msgspec dependency (pip install notion-requests[struct])
+"""
+
+import msgspec
+
+from typing import List, Optional
+
+
+class QueryResponse(msgspec.Struct):
+    """
+    A single page of a paginated query, list, or search response. Decoding into this struct skips building a
+    dict for the envelope and is noticeably faster than a plain json decode for large pages; the individual
+    results stay dicts since their shape is open ended
+    """
+    object: str
+    results: List[dict]
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+
+# the decoder is schema directed, so build it once and reuse it for every page
+_query_decoder = msgspec.json.Decoder(QueryResponse)
+
+
+def decode_query_response(content: bytes) -> QueryResponse:
+    """
+    Decodes a page of a paginated response with the cached msgspec decoder
+
+    :param content: The raw response body
+    :return: A QueryResponse struct
+    """
+    return _query_decoder.decode(content)
@@ -36,6 +36,14 @@ setup(
     install_requires=[
         'requests',
     ],
+    extras_require={
+        'async': ['httpx[http2]'],
+        'brotli': ['brotli'],
+        'cache': ['requests-cache'],
+        'orjson': ['orjson'],
+        'stream': ['ijson'],
+        'struct': ['msgspec'],
+    },
     classifiers=(
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -12,45 +12,75 @@ import requests
 import string
 import unittest
 
+from inspect import iscoroutinefunction
 from notion_requests import Client
 from types import FunctionType
 
+try:
+    # the async client is an optional extra that requires httpx
+    import httpx
+    from notion_requests import AsyncClient
+except ImportError:
+    httpx = None
+    AsyncClient = None
+
+# the async client raises httpx errors instead of requests ones
+if httpx is None:
+    _HTTP_ERRORS = (requests.exceptions.HTTPError,)
+else:
+    _HTTP_ERRORS = (requests.exceptions.HTTPError, httpx.HTTPStatusError)
+
 
 def pretty_print(data):
     print(json.dumps(data, indent=4))
 
 
-class MetaClass(type):
-    def catch_http_exception(fn):
-        def wrapper(*args, **kwargs):
-            try:
-                fn(*args, **kwargs)
-            except requests.exceptions.HTTPError as e:
-                data = e.response.json()
-                # pretty print for better formatted debugging
-                pretty_print(data)
-                raise Exception(str(data))
+def catch_http_exceptions(cls):
+    """
+    A class decorator that wraps a test class's test methods to print the json output of a failed request
+    """
+    def wrap(fn):
+        if iscoroutinefunction(fn):
+            async def wrapper(*args, **kwargs):
+                try:
+                    await fn(*args, **kwargs)
+                except _HTTP_ERRORS as e:
+                    data = e.response.json()
+                    # pretty print for better formatted debugging
+                    pretty_print(data)
+                    raise Exception(str(data))
+        else:
+            def wrapper(*args, **kwargs):
+                try:
+                    fn(*args, **kwargs)
+                except _HTTP_ERRORS as e:
+                    data = e.response.json()
+                    # pretty print for better formatted debugging
+                    pretty_print(data)
+                    raise Exception(str(data))
 
         return wrapper
 
-    def __new__(mcs, classname, bases, class_dict):
-        new_class_dict = {}
-        for attribute_name, attribute in class_dict.items():
-            # only wrap the attributes that are functions and start with the word "test"
-            if isinstance(attribute, FunctionType) and attribute_name.startswith('test'):
-                attribute = mcs.catch_http_exception(attribute)
+    for attribute_name, attribute in list(vars(cls).items()):
+        # only wrap the attributes that are functions and start with the word "test"
+        if isinstance(attribute, FunctionType) and attribute_name.startswith('test'):
+            setattr(cls, attribute_name, wrap(attribute))
 
-            # set attributes
-            new_class_dict[attribute_name] = attribute
+    return cls
 
-        return type.__new__(mcs, classname, bases, new_class_dict)
 
+class TestBase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # one client per test class so every test reuses the same pooled connection
+        cls.notion = Client(os.environ['NOTION_TOKEN'])
 
-class TestBase(unittest.TestCase, metaclass=MetaClass):
-    def setUp(self):
-        self.notion = Client(os.environ['NOTION_TOKEN'])
+    @classmethod
+    def tearDownClass(cls):
+        cls.notion.close()
 
 
+@catch_http_exceptions
 class TestDatabases(TestBase):
     def test_query(self):
         database_id = os.environ['NOTION_DATABASE_QUERY_ID']
@@ -123,6 +153,42 @@ class TestDatabases(TestBase):
 
         self.assertEqual(expected_count, actual_count)
 
+    def test_query_prefetch(self):
+        database_id = os.environ['NOTION_DATABASE_QUERY_ID']
+        query = {
+            'database_id': database_id,
+            'filter': {
+                'and': [
+                    {
+                        'property': 'Type',
+                        'select': {
+                            'equals': 'fruit'
+                        }
+                    },
+                    {
+                        'property': 'Notes',
+                        'text': {
+                            'is_not_empty': True
+                        }
+                    }
+                ]
+            },
+            'sorts': [
+                {
+                    'property': 'Name',
+                    'direction': 'ascending'
+                }
+            ],
+            'page_size': 1
+        }
+
+        expected_count = 2
+        actual_count = 0
+        for response in self.notion.databases.query(prefetch=True, **query):
+            actual_count += len(response['results'])
+
+        self.assertEqual(expected_count, actual_count)
+
     def test_create_and_update_and_delete(self):
         parent_page_id = os.environ['NOTION_PARENT_PAGE_ID']
         database_name = 'Grocery List'
@@ -198,6 +264,7 @@ class TestDatabases(TestBase):
         self.assertEqual(expected_count, actual_count)
 
 
+@catch_http_exceptions
 class TestPages(TestBase):
     def test_retrieve(self):
         page_id = os.environ['NOTION_PAGE_ID']
@@ -207,6 +274,15 @@ class TestPages(TestBase):
         self.assertEqual(page_id, response['id'].replace('-', ''))
         self.assertEqual(page_name, response['properties']['title']['title'][0]['plain_text'])
 
+    def test_retrieve_many(self):
+        page_id = os.environ['NOTION_PAGE_ID']
+        page_name = os.environ['NOTION_PAGE_NAME']
+        responses = self.notion.pages.retrieve_many([page_id])
+        self.assertEqual(1, len(responses))
+        self.assertEqual('page', responses[0]['object'])
+        self.assertEqual(page_id, responses[0]['id'].replace('-', ''))
+        self.assertEqual(page_name, responses[0]['properties']['title']['title'][0]['plain_text'])
+
     def test_create_and_update(self):
         parent_page_id = os.environ['NOTION_PAGE_ID']
         new_page_name = 'Nested Page'
@@ -254,6 +330,7 @@ class TestPages(TestBase):
         self.notion.blocks.delete(new_page_id)
 
 
+@catch_http_exceptions
 class TestBlocks(TestBase):
     def test_retrieve(self):
         block_id = os.environ['NOTION_TEXT_BLOCK_ID']
@@ -263,6 +340,15 @@ class TestBlocks(TestBase):
         self.assertEqual(block_id, response['id'].replace('-', ''))
         self.assertEqual(text_block_content, response['paragraph']['text'][0]['text']['content'])
 
+    def test_retrieve_many(self):
+        block_id = os.environ['NOTION_TEXT_BLOCK_ID']
+        text_block_content = os.environ['NOTION_TEXT_BLOCK_CONTENT']
+        responses = self.notion.blocks.retrieve_many([block_id])
+        self.assertEqual(1, len(responses))
+        self.assertEqual('block', responses[0]['object'])
+        self.assertEqual(block_id, responses[0]['id'].replace('-', ''))
+        self.assertEqual(text_block_content, responses[0]['paragraph']['text'][0]['text']['content'])
+
     def test_update(self):
         letters = string.ascii_letters
         random_text = ''.join(random.choice(letters) for i in range(10))
@@ -326,6 +412,7 @@ class TestBlocks(TestBase):
         self.notion.blocks.delete(response['results'][0]['id'])
 
 
+@catch_http_exceptions
 class TestUsers(TestBase):
     def test_retrieve(self):
         user_name = os.environ['NOTION_USER_NAME']
@@ -354,6 +441,7 @@ class TestUsers(TestBase):
         self.assertEqual(user_id, response['id'])
 
 
+@catch_http_exceptions
 class TestSearch(TestBase):
     def test_search(self):
         expected_count = 1
@@ -370,3 +458,71 @@ class TestSearch(TestBase):
             actual_count += len(response['results'])
 
         self.assertEqual(expected_count, actual_count)
+
+
+# IsolatedAsyncioTestCase is only available on python 3.8 or later
+_AsyncTestBase = getattr(unittest, 'IsolatedAsyncioTestCase', unittest.TestCase)
+
+
+@unittest.skipIf(AsyncClient is None, 'requires the optional httpx dependency')
+@unittest.skipIf(_AsyncTestBase is unittest.TestCase, 'requires python 3.8 or later')
+@catch_http_exceptions
+class TestAsyncClient(_AsyncTestBase):
+    async def asyncSetUp(self):
+        self.notion = AsyncClient(os.environ['NOTION_TOKEN'])
+
+    async def asyncTearDown(self):
+        await self.notion.close()
+
+    async def test_users_me(self):
+        response = await self.notion.users.me()
+        user_name = os.environ['NOTION_USER_NAME']
+        user_id = os.environ['NOTION_USER_ID']
+
+        self.assertEqual('user', response['object'])
+        self.assertEqual(user_name, response['name'])
+        self.assertEqual(user_id, response['id'])
+
+    async def test_pages_retrieve(self):
+        page_id = os.environ['NOTION_PAGE_ID']
+        page_name = os.environ['NOTION_PAGE_NAME']
+        response = await self.notion.pages.retrieve(page_id)
+        self.assertEqual('page', response['object'])
+        self.assertEqual(page_id, response['id'].replace('-', ''))
+        self.assertEqual(page_name, response['properties']['title']['title'][0]['plain_text'])
+
+    async def test_databases_query_pagination(self):
+        database_id = os.environ['NOTION_DATABASE_QUERY_ID']
+        query = {
+            'database_id': database_id,
+            'filter': {
+                'and': [
+                    {
+                        'property': 'Type',
+                        'select': {
+                            'equals': 'fruit'
+                        }
+                    },
+                    {
+                        'property': 'Notes',
+                        'text': {
+                            'is_not_empty': True
+                        }
+                    }
+                ]
+            },
+            'sorts': [
+                {
+                    'property': 'Name',
+                    'direction': 'ascending'
+                }
+            ],
+            'page_size': 1
+        }
+
+        expected_count = 2
+        actual_count = 0
+        async for response in self.notion.databases.query(**query):
+            actual_count += len(response['results'])
+
+        self.assertEqual(expected_count, actual_count)